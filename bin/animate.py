@@ -18,13 +18,13 @@ fg = FiniteGrid(N, boundary='periodic', dump=True)
 def update(data):
     fg.evolve(draw=False)
     plt.title(f"generation={fg.generation}")
-    mat.set_data(fg.states)
+    mat.set_data(fg.view)
     return [mat]
 
 
 if __name__ == "__main__":
     # set up animation
     fig, ax = plt.subplots()
-    mat = ax.matshow(fg.states)
+    mat = ax.matshow(fg.view)
     ani = animation.FuncAnimation(fig, update, interval=50, save_count=50)
     plt.show()
\ No newline at end of file
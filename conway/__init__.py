@@ -11,9 +11,86 @@ Top-level package for conway
 __version__ = "0.4.2"
 
 import numpy as np
-import pickle
 import time
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import scipy.ndimage
+except ImportError:
+    scipy = None
+
+try:
+    # binary extension module, built from conway/cpp_step
+    from conway import step as _cpp
+except ImportError:
+    _cpp = None
+
+
+if njit is None:
+    _step = None
+else:
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def _step(states, new_states, N):
+        """Store the next generation of the interior cells of ``states`` in ``new_states``.
+
+        Each row is processed with a branchless loop over 1D views of the rows above, at
+        and below, i.e. over contiguous memory, which LLVM can vectorize. The neighbour
+        count of a cell is kept in a register, so no count array is needed. The rows
+        are distributed over the available threads.
+        """
+        for i in prange(1, N+1):
+            above = states[i-1]
+            row   = states[i  ]
+            below = states[i+1]
+            out   = new_states[i]
+            for j in range(1, N+1):
+                count = above[j-1] + above[j] + above[j+1] \
+                      + row  [j-1]            + row  [j+1] \
+                      + below[j-1] + below[j] + below[j+1]
+                # a cell lives if it has 3 living neighbours, or if it is alive and has 2
+                out[j] = (count == 3) | ((row[j] == 1) & (count == 2))
+
+
+def _step_numpy(s, new_states):
+    """Store the next generation of the interior cells of ``s`` in ``new_states``,
+    using vectorized numpy operations.
+
+    ``s`` is an (M+2)x(N+2) array, so that it can also be applied to a tile of rows.
+    """
+    M, N = s.shape[0] - 2, s.shape[1] - 2
+    # count the living neighbours of all interior cells at once
+    c = s[0:M  , 0:N] + s[0:M  , 1:N+1] + s[0:M  , 2:N+2] \
+      + s[1:M+1, 0:N]                   + s[1:M+1, 2:N+2] \
+      + s[2:M+2, 0:N] + s[2:M+2, 1:N+1] + s[2:M+2, 2:N+2]
+    # apply the rules: a cell lives if it has 3 living neighbours, or if it
+    # is alive and has 2 living neighbours
+    alive = s[1:M+1, 1:N+1]
+    new_states[1:M+1, 1:N+1] = (c == 3) | ((alive == 1) & (c == 2))
+
+
+def _gol_lut():
+    """Build the lookup table for the next state of a cell as a function of the
+    states of its 3x3 neighbourhood.
+
+    The index is a 9 bit number, with bit ``3*di + dj`` the state of cell ``(i+di-1,j+dj-1)``.
+    Hence, bit 4 is the state of the cell itself.
+    """
+    lut = np.zeros(512, dtype=np.uint8)
+    for k in range(512):
+        count = bin(k & 0b111101111).count('1')
+        alive = (k >> 4) & 1
+        lut[k] = count == 3 or (alive and count == 2)
+    return lut
+
+_GOL_LUT = _gol_lut()
+
+# the weights of the 3x3 neighbourhood for the scipy kernel
+_NEIGHBOURHOOD = np.ones((3,3), dtype=np.uint8)
+
 
 class FiniteGrid:
     """Naive NxN grid with different boundary conditions. Cells are randomly assigned
@@ -21,10 +98,10 @@ class FiniteGrid:
 
     :param int N: number of cells in the X and Y direction.
     :param str boundary: boundary condition: ``zero``, ``reflecting``, or ``periodic``.
-    :param bool dump: pickle the generated FiniteGrid object. (Practical if you
-        discover a nice pattern and you want to view it again.
-    :param bool load: if True, load a file with a pickled FiniteGrid object, e.g. to
-        view its evolution again.
+    :param bool dump: save the generated FiniteGrid object, see :py:meth:`dump`. (Practical
+        if you discover a nice pattern and you want to view it again.
+    :param bool load: if True, load a file with a saved FiniteGrid object, e.g. to
+        view its evolution again. ``N`` and ``boundary`` are then read from the file.
     :param str filename: name of the file to be dumped or loaded.
 
     In order to not have to implement special boundary rules, we make the grid
@@ -77,81 +154,145 @@ class FiniteGrid:
         --+---------+--
         0 | 0 0 1 0 | 0
 
+    These are the same as padding the interior cells with ``numpy.pad(interior, 1, mode)``,
+    with ``mode`` equal to ``'constant'``, ``'edge'`` and ``'wrap'``, respectively. However,
+    ``numpy.pad`` allocates a new array every generation, whereas the boundary conditions
+    are applied in place, with a few slice assignments.
+
     """
     boundary_conditions = ('zero', 'reflect', 'periodic')
 
+    # the names of the methods applying the boundary conditions
+    _bc_methods = {'zero': 'apply_0bc', 'reflect': 'apply_rbc', 'periodic': 'apply_pbc'}
+
+    kernels = ('numpy', 'lut') \
+            + (('numba',) if not _step is None else ()) \
+            + (('scipy',) if not scipy is None else ()) \
+            + (('cpp',) if not _cpp is None else ())
+    """The available kernels for computing the next generation:
+
+    * ``numpy``: vectorized numpy operations,
+    * ``lut``: a lookup table with the next state for all 512 3x3 neighbourhoods,
+    * ``numba``: a numba compiled, multi-threaded loop (requires numba),
+    * ``scipy``: a convolution with a 3x3 kernel of ones (requires scipy),
+    * ``cpp``: a vectorized, OpenMP parallel C++ loop (requires building the
+      binary extension module ``conway.step`` from ``conway/cpp_step``).
+    """
+
+    kernel = 'numba' if 'numba' in kernels else 'numpy'
+    """The kernel used for computing the next generation, one of :py:attr:`kernels`.
+    Defaults to ``numba`` if numba is installed.
+    """
+
     def __init__(self, N=10, boundary='zero', dump=False, load=False, filename='conway'):
         if load:
-            fg = FiniteGrid.load(filename=filename)
-            # transfer all properties from fg to self
-            self.__dict__ = fg.__dict__
-
+            N, boundary, generation, interior = self._read(filename=filename)
         else:
-            self.N = N
+            # only the interior cells are random, the ghost cells are set by the boundary condition
             rng = np.random.default_rng()
-            self.states = rng.integers(0, high=2, size=(N+2,N+2))
-            # correct the boundaries
-            if 'zero'.startswith(boundary):
-                self.bc = 'zero'
-                # boundaries are zeros
-                self.apply_0bc()
+            interior = rng.integers(0, high=2, size=(N,N), dtype=np.uint8)
+            generation = 0
+
+        self.N = N
+        states = np.zeros((N+2,N+2), dtype=np.uint8)
+        states[1:N+1, 1:N+1] = interior
+        self.states = states
+        # correct the boundaries
+        if 'zero'.startswith(boundary):
+            self.apply_bc('zero')
+        elif 'reflect'.startswith(boundary):
+            self.apply_bc('reflect')
+        elif 'periodic'.startswith(boundary):
+            self.apply_bc('periodic')
+        else:
+            raise ValueError("boundary not in ('zero', 'reflect', 'periodic')")
 
-            elif 'reflect'.startswith(boundary):
-                self.bc = 'reflect'
-                self.apply_rbv()
+        self.generation = generation
+        self._scratch = None
+        self.symbols = ' X'
+        self._last_drawn = None
+        self._last_lines = None
+        self._view = None
 
-            elif 'periodic'.startswith(boundary):
-                self.bc = 'periodic'
-                self.apply_pbc()
+        if dump and not load:
+            self.dump(filename=filename)
 
-            else:
-                raise ValueError("boundary not in ('zero', 'reflect', 'periodic')")
 
-            self.generation = 0
-            self.counts = None
-            self.symbols = ' X'
+    @property
+    def view(self):
+        """The states of the interior cells, as an NxN array.
 
-            if dump:
-                self.dump(filename=filename)
+        This is always the same array, which is updated on every access, so that it
+        can be handed once to e.g. matplotlib's ``matshow``, while ``self.states``
+        changes identity every generation (see :py:meth:`evolve`).
+        """
+        N = self.N
+        if self._view is None:
+            self._view = np.empty((N,N), dtype=np.uint8)
+        np.copyto(self._view, self.states[1:N+1, 1:N+1])
+        return self._view
+
+    @property
+    def bc(self):
+        """The boundary condition, one of :py:attr:`boundary_conditions`.
+
+        Setting ``bc`` also selects the method applying it, which is stored in
+        ``self._apply_bc``, so that :py:meth:`evolve` does not have to dispatch on
+        ``self.bc`` every generation. The boundary condition is not applied, call
+        :py:meth:`apply_bc` for that.
+        """
+        return self._bc
 
+    @bc.setter
+    def bc(self, bc):
+        try:
+            self._apply_bc = getattr(self, self._bc_methods[bc])
+        except KeyError:
+            raise ValueError("boundary not in ('zero', 'reflect', 'periodic')") from None
+        self._bc = bc
 
     def apply_bc(self, bc=None):
         """Apply a boundary condition to this FiniteGrid object.
 
         :param str bc: a string identifying the type of boundary condition we want to apply.
+            If None, the current boundary condition :py:attr:`bc` is applied.
         """
         if not bc is None:
             self.bc = bc
-        if self.bc == 'zero':
-            self.apply_0bc()
-        elif self.bc == 'reflect':
-            self.apply_rbc()
-        elif self.bc == 'periodic':
-            self.apply_pbc()
-        else:
-            raise ValueError("boundary not in ('zero', 'reflect', 'periodic')")
+        self._apply_bc()
 
-    def apply_0bc(self):
+    def apply_0bc(self, states=None, g0=0):
         """Apply the zero boundary condition, i.e. surround this FiniteGrid
         object by zeros.
+
+        :param states: rows ``g0``, ``g0+1``, ... of the grid, to which the boundary
+            condition is applied. Defaults to ``self.states``. (:py:meth:`evolve_tiled`
+            applies the boundary condition to tiles of rows.)
+        :param int g0: the index in the grid of the first row of ``states``.
         """
         N = self.N
-        self.states[:    , 0    ] = 0
-        self.states[:    , N + 1] = 0
-        self.states[0    , 1:N+1] = 0
-        self.states[N + 1, 1:N+1] = 0
-
-    def apply_rbc(self):
+        if states is None:
+            states = self.states
+        # the slice 0::N+1 selects both index 0 and index N+1
+        states[:, 0::N+1] = 0
+        ghost, inside = self._ghost_rows(states, g0)
+        states[ghost] = 0
+
+    def apply_rbc(self, states=None, g0=0):
         """Apply the reflecting boundary condition, i.e. the surroundig elements
         have the same value as the value on the inside of the boundary.
+
+        The parameters are the same as for :py:meth:`apply_0bc`.
         """
         N = self.N
-        self.states[:, 0    ] = self.states[:, 1]
-        self.states[:, N + 1] = self.states[:, N]
-        self.states[0, :    ] = self.states[1, :]
-        self.states[N + 1, :] = self.states[N, :]
-
-    def apply_pbc(self):
+        if states is None:
+            states = self.states
+        states[:, 0    ] = states[:, 1]
+        states[:, N + 1] = states[:, N]
+        ghost, inside = self._ghost_rows(states, g0)
+        states[ghost] = states[inside]
+
+    def apply_pbc(self, states=None, g0=0):
         """Apply the periodic boundary condition.
 
         This can be viewed as:
@@ -160,18 +301,36 @@ class FiniteGrid:
           are glued together. That first gives a tube and then a torus.
         * the square being part of an infinite repetition along each axis
           yielding a periodic pattern.
+
+        The parameters are the same as for :py:meth:`apply_0bc`. The ghost rows of a
+        tile of rows are not set, as :py:meth:`evolve_tiled` extends the tile with the
+        periodic images of the rows.
         """
         N = self.N
-        # edges
-        self.states[1:N + 1, 0] = self.states[1:N + 1, N]
-        self.states[1:N + 1, N + 1] = self.states[1:N + 1, 1]
-        self.states[0, 1:N + 1] = self.states[N, 1:N + 1]
-        self.states[N + 1, 1:N + 1] = self.states[1, 1:N + 1]
-        # corners
-        self.states[0    , 0    ] = self.states[N, N]
-        self.states[N + 1, N + 1] = self.states[1, 1]
-        self.states[0    , N + 1] = self.states[N, 1]
-        self.states[N + 1, 0    ] = self.states[1, N]
+        tile = not states is None
+        if not tile:
+            states = self.states
+        # left and right edges
+        states[:, 0    ] = states[:, N]
+        states[:, N + 1] = states[:, 1]
+        if not tile:
+            # top and bottom edges, copying entire rows also takes care of the corners,
+            # as the ghost cells of rows N and 1 have just been set.
+            states[0    , :] = states[N, :]
+            states[N + 1, :] = states[1, :]
+
+    def _ghost_rows(self, states, g0):
+        """Return the indices in ``states``, rows ``g0``, ``g0+1``, ... of the grid, of
+        the ghost rows 0 and N+1, and of the adjacent interior rows 1 and N.
+
+        Ghost rows that are not in ``states`` are omitted.
+        """
+        ghost, inside = [], []
+        for g, i in ((0, 1), (self.N + 1, self.N)):
+            if 0 <= g - g0 < states.shape[0]:
+                ghost.append(g - g0)
+                inside.append(i - g0)
+        return ghost, inside
 
     def evolve(self, n_generations=1, draw=True, stop_if_static=False, curse=None, interval=0.1):
         """Let the system evolve over ``generations`` generations.
@@ -185,43 +344,25 @@ class FiniteGrid:
             ``stop_if_static`` does not end the evolution when patterns occur that are periodic in
             time. A typical and much occurring time periodic pattern is three live cells in a row
             which alternate being aligned along the X-axis and the Y-axis.
-        """
-        if self.counts is None:
-            self.counts = np.zeros_like(self.states, dtype=int)
 
-        N = self.N
+        .. note:
+            The states are double buffered: every generation is computed in a second
+            array, which then becomes ``self.states``. Hence, an array obtained as
+            ``fg.states`` before calling ``evolve`` contains an earlier generation
+            afterwards. Always access the current generation as ``fg.states``.
+        """
         while n_generations>0:
-            if stop_if_static:
-                previous_states = np.copy(self.states)
-            for i in range(1,N+1):
-                for j in range(1,N+1):
-                    self.counts[i, j] = self.states[i-1, j-1] \
-                                      + self.states[i-1, j  ] \
-                                      + self.states[i-1, j+1] \
-                                      + self.states[i  , j-1] \
-                                      + self.states[i  , j+1] \
-                                      + self.states[i+1, j-1] \
-                                      + self.states[i+1, j  ] \
-                                      + self.states[i+1, j+1]
-            for i in range(1,N+1):
-                for j in range(1,N+1):
-                    if self.states[i,j] == True: # populated
-                        if not self.counts[i,j] in (2,3): # cell population dies
-                            self.states[i,j] = False
-                    else:
-                        if self.counts[i,j] == 3:
-                            self.states[i,j] = True
-
+            self._update()
             self.apply_bc()
             self.generation += 1
             n_generations -= 1
             # stop if all cells are dead
-            if np.sum(self.states) == 0:
-                generations = 0
+            if self._is_dead():
+                n_generations = 0
             # stop if fixed state
             if stop_if_static:
-                if np.all(previous_states == self.states):
-                    generations = 0
+                if self._is_static():
+                    n_generations = 0
             if not curse is None:
                 self.curse(curse)
                 time.sleep(interval)
@@ -229,6 +370,121 @@ class FiniteGrid:
                 self.print(boundary=False)
 
 
+    def evolve_tiled(self, n_generations=1, tile_rows=64, tile_t=8):
+        """Let the system evolve over ``n_generations`` generations, using temporal blocking.
+
+        The interior rows are divided in tiles of ``tile_rows`` rows, and each tile is
+        advanced ``tile_t`` generations at once before moving on to the next tile. To
+        that end, the tile is extended with ``tile_t`` rows on either side, of which
+        one row on either side becomes invalid every generation. For grids that do not
+        fit in the cache, the grid is thus read from memory once per ``tile_t``
+        generations, rather than every generation. For small grids, use a single tile
+        (``tile_rows >= N``).
+
+        The generations are computed with vectorized numpy operations, irrespective of
+        :py:attr:`kernel`, and are not drawn. The evolution does not stop when all
+        cells are dead.
+
+        :param int n_generations: the number of generation to evolve.
+        :param int tile_rows: the number of rows in a tile.
+        :param int tile_t: the number of generations a tile is advanced at once.
+        :raises ValueError: if ``tile_rows`` or ``tile_t`` is not positive.
+        """
+        if tile_rows <= 0 or tile_t <= 0:
+            raise ValueError("tile_rows and tile_t must be positive")
+        N = self.N
+        # the method applying the boundary condition to the uint8 states, also for a
+        # PackedGrid, whose states are unpacked.
+        apply_tile_bc = getattr(FiniteGrid, self._bc_methods[self.bc])
+        while n_generations > 0:
+            T = min(tile_t, n_generations)
+            states = self.states
+            # the rows g = 1-T, ..., N+T of the grid, extended beyond the ghost rows:
+            # row g of the grid is row g-1+T of extended.
+            g = np.arange(1 - T, N + T + 1)
+            if self.bc == 'periodic':
+                extended = states[(g - 1) % N + 1]
+            else:
+                # the ghost rows are set in every generation by apply_tile_bc, the rows
+                # beyond only affect the ghost rows.
+                extended = np.zeros((g.size, N+2), dtype=states.dtype)
+                inside = (0 <= g) & (g <= N+1)
+                extended[inside] = states[g[inside]]
+            new_states = np.empty_like(states)
+            for r0 in range(1, N+1, tile_rows):
+                r1 = min(r0 + tile_rows, N+1)
+                # rows r0-T, ..., r1+T-1 of the grid
+                tile = extended[r0-1:r1+2*T-1].copy()
+                scratch = np.empty_like(tile)
+                for t in range(T):
+                    _step_numpy(tile, scratch)
+                    tile, scratch = scratch, tile
+                    apply_tile_bc(self, tile, r0 - T)
+                # after T generations only rows r0, ..., r1-1 are still valid
+                new_states[r0:r1] = tile[T:T + r1 - r0]
+            self.states = new_states
+            self.apply_bc()
+            self.generation += T
+            n_generations -= T
+
+    def _update(self):
+        """Replace the states of the interior cells by those of the next generation.
+
+        The next generation is computed in a scratch buffer, which is then swapped
+        with ``self.states``. The boundary condition is not applied, so the ghost
+        cells are undefined afterwards.
+
+        :raises ValueError: if :py:attr:`kernel` is not one of the available :py:attr:`kernels`.
+        """
+        if not self.kernel in self.kernels:
+            raise ValueError(f"kernel '{self.kernel}' not in {self.kernels}")
+
+        if self._scratch is None:
+            self._scratch = np.empty_like(self.states)
+
+        N = self.N
+        if self.kernel == 'numba':
+            _step(self.states, self._scratch, N)
+        elif self.kernel == 'cpp':
+            _cpp.step(self.states, self._scratch)
+        elif self.kernel == 'lut':
+            s = self.states.astype(np.uint16)
+            # pack the 3x3 neighbourhood of all interior cells in a 9 bit index
+            index = s[0:N  , 0:N]      | s[0:N  , 1:N+1] << 1 | s[0:N  , 2:N+2] << 2 \
+                  | s[1:N+1, 0:N] << 3 | s[1:N+1, 1:N+1] << 4 | s[1:N+1, 2:N+2] << 5 \
+                  | s[2:N+2, 0:N] << 6 | s[2:N+2, 1:N+1] << 7 | s[2:N+2, 2:N+2] << 8
+            self._scratch[1:N+1, 1:N+1] = _GOL_LUT[index]
+        elif self.kernel == 'scipy':
+            s = self.states
+            # sum over the 3x3 neighbourhood, including the cell itself. The ghost
+            # cells already hold the boundary condition, so the mode of the
+            # convolution only affects the ghost cells, which are discarded.
+            total = scipy.ndimage.convolve(s, _NEIGHBOURHOOD, mode='constant')[1:N+1, 1:N+1]
+            # with the cell itself included, a cell lives if the total is 3, or if
+            # it is alive and the total is 4
+            alive = s[1:N+1, 1:N+1]
+            self._scratch[1:N+1, 1:N+1] = (total == 3) | ((alive == 1) & (total == 4))
+        else:
+            _step_numpy(self.states, self._scratch)
+        # the new generation becomes the current one, the ghost cells are set by
+        # the boundary condition
+        self.states, self._scratch = self._scratch, self.states
+
+    def _is_dead(self):
+        """Test if all interior cells are dead."""
+        N = self.N
+        return not self.states[1:N+1, 1:N+1].any()
+
+    def _is_static(self):
+        """Test if the interior cells did not change during the last generation.
+
+        This compares ``self.states`` to the scratch buffer, which still contains
+        the previous generation after :py:meth:`_update`, so no copy is needed.
+        """
+        N = self.N
+        return np.array_equal(self.states[1:N+1, 1:N+1], self._scratch[1:N+1, 1:N+1])
+
+
     def print(self, boundary=True, symbols=None):
         """Print this FiniteGrid object to the terminal.
 
@@ -239,65 +495,238 @@ class FiniteGrid:
         """
         if symbols:
             self.symbols = symbols
-        irange = range(self.N+2) if boundary else range(1,self.N+1)
-        jrange = range(self.N+2) if boundary else range(1,self.N+1)
         # print(f'BC = {self.bc}')
-        for i in irange:
-            s = ''
-            for j in jrange:
-                s += self.symbols[self.states[i,j]]
-            print(s)
+        for line in self._lines(boundary):
+            print(line)
         print()
 
-    def curse(self, stdscr, boundary=True, symbols=None):
+    def curse(self, stdscr, boundary=True, symbols=None, redraw=False):
         """'Print' the FiniteGrid object to the terminal using the Python curses module.
 
         This gives a nicer visualization because the successive generations are overwriting
         each other, thus being more close to an animation. The current implementation is
         limited to the size of the terminal.
 
+        Only the cells that changed since the previous call are drawn, unless ``boundary``
+        or ``symbols`` changed, or ``redraw`` is True.
+
         :param stdscr: the curses wrapper object for the terminal.
         :param bool boundary: if True, also prints the surrounding boundary layers.
         :param list-like symbols: use ``symbols[0]`` for denoting dead cells, and
             ``symbols[1]`` for denoting living cells in the output. The defaults are
             `` `` and ``X``.
+        :param bool redraw: if True, draw all cells, e.g. after the terminal was cleared.
         """
         if symbols:
             self.symbols = symbols
-        irange = range(self.N+2) if boundary else range(1,self.N+1)
-        jrange = range(self.N+2) if boundary else range(1,self.N+1)
-        for i in irange:
-            s = ''
-            for j in jrange:
-                s += self.symbols[self.states[i,j]]
-            stdscr.addstr(i, 0, s)
-        stdscr.addstr(i+1, 0, str(self.generation))
+        N = self.N
+        states = self.states if boundary else self.states[1:N+1, 1:N+1]
+        i0 = 0 if boundary else 1
+        drawn_with = (boundary, self.symbols[0], self.symbols[1])
+        width = len(self.symbols[0])
+        if redraw or self._last_drawn is None or self._last_drawn_with != drawn_with \
+                  or width != len(self.symbols[1]):
+            for i, line in enumerate(self._lines(boundary), start=i0):
+                stdscr.addstr(i, 0, line)
+            self._last_drawn = states.copy()
+            self._last_drawn_with = drawn_with
+        else:
+            for i, j in zip(*np.nonzero(states != self._last_drawn)):
+                stdscr.addstr(i0 + i, j*width, self.symbols[states[i,j]])
+            self._last_drawn[:,:] = states
+        stdscr.addstr(i0 + states.shape[0], 0, str(self.generation))
         stdscr.refresh()
 
+    def _lines(self, boundary=True):
+        """Convert the states to a tuple of strings, one per row, using ``self.symbols``.
+
+        :param bool boundary: if True, also converts the surrounding boundary layers.
+
+        The lines of the last call are kept, and returned again if the states, ``boundary``
+        and ``self.symbols`` are the same. The states are compared by value, so that
+        modifying ``self.states`` in place is also detected.
+        """
+        states = self.states
+        if not boundary:
+            states = states[1:self.N+1, 1:self.N+1]
+        key = (states.tobytes(), boundary, self.symbols[0], self.symbols[1])
+        if self._last_lines is not None and self._last_lines[0] == key:
+            return self._last_lines[1]
+        if len(self.symbols[0]) == len(self.symbols[1]):
+            # look up the characters of all cells at once, and view each row of
+            # characters as a single string.
+            chars = np.array([list(self.symbols[0]), list(self.symbols[1])])
+            rows = np.ascontiguousarray(chars[states].reshape(states.shape[0], -1))
+            lines = tuple(rows.view(f'U{rows.shape[1]}').ravel().tolist())
+        else:
+            symbols = self.symbols
+            lines = tuple(''.join(symbols[state] for state in row) for row in states.tolist())
+        self._last_lines = (key, lines)
+        return lines
+
 
     def dump(self,filename='conway'):
-        """Pickle this FiniteGrid object (save to file).
+        """Save this FiniteGrid object to file ``<filename>.npz``.
+
+        Only ``N``, ``bc``, ``generation`` and the states of the interior cells are saved,
+        in a compressed numpy ``.npz`` file.
 
-        :parameter str filename: name of the pickle file to contain the pickled FiniteGrid object>
+        :parameter str filename: name of the file, without the ``.npz`` extension.
         """
-        self.counts = None # we do not need to dump counts
-        with open(f"{filename}.pickle", mode='wb') as file:
-            pickle.dump(self, file=file)
-            
+        N = self.N
+        np.savez_compressed( f"{filename}.npz"
+                           , N=N, bc=self.bc, generation=self.generation
+                           , states=self.states[1:N+1, 1:N+1]
+                           )
 
     @staticmethod
-    def load(filename='conway'):
-        """Unpickle a pickled FiniteGrid object.
+    def _read(filename='conway'):
+        """Read the data saved by :py:meth:`dump`.
 
-        :parameter str filename: name of the pickle file containing the pickled FiniteGrid object.
-        :return: a FiniteGrid object
-        :raises: RuntimeError if unpickling the file does not yield a FiniteGrid object.
+        :return: tuple ``(N, bc, generation, states)``, ``states`` containing the
+            states of the interior cells only.
+        :raises: RuntimeError if the file does not contain a dumped FiniteGrid object.
+        """
+        fn = f"{filename}.npz"
+        with np.load(fn) as data:
+            try:
+                return int(data['N']), str(data['bc']), int(data['generation']), data['states']
+            except KeyError:
+                raise RuntimeError(f"File '{fn}' does not contain a 'FiniteGrid' object.") from None
+
+    @classmethod
+    def load(cls, filename='conway'):
+        """Load a FiniteGrid object saved by :py:meth:`dump`.
+
+        :parameter str filename: name of the file, without the ``.npz`` extension.
+        :return: an object of the class on which ``load`` is called, e.g. a
+            :py:class:`PackedGrid` for ``PackedGrid.load(filename)``.
+        :raises: RuntimeError if the file does not contain a dumped FiniteGrid object.
         """
-        fn = f"{filename}.pickle"
-        with open(fn, mode='rb') as file:
-            fg = pickle.load(file=file)
+        return cls(load=True, filename=filename)
+
 
-        if not isinstance(fg,FiniteGrid):
-            raise RuntimeError(f"File '{fn}' does not contain a 'FiniteGrid' object.")
+class PackedGrid(FiniteGrid):
+    """FiniteGrid storing 64 cells in a single ``uint64`` word.
 
-        return fg
\ No newline at end of file
+    Every row of the (N+2)x(N+2) grid, ghost cells included, is stored in
+    ``ceil((N+2)/64)`` words: the state of cell ``(i,j)`` is bit ``j%64`` of
+    ``self.packed[i,j//64]``. A generation is computed for 64 cells at once using
+    only bitwise operations (SWAR, SIMD within a register):
+
+    * the 8 neighbours of each cell are obtained as 8 bitplanes by shifting the
+      rows above, at and below the cell one bit to the left and to the right,
+    * the bitplanes are summed with a chain of half adders, yielding the bits
+      ``b0``, ``b1`` and ``b2`` of the neighbour count modulo 8. (A count of 8
+      wraps to 0, which is harmless as such a cell dies anyway.)
+    * the cell is alive in the next generation if ``b1 & ~b2 & (b0 | alive)``, i.e.
+      if it has exactly 3 living neighbours, or if it is alive and has exactly 2.
+
+    The parameters are the same as for :py:class:`FiniteGrid`. The ``states``
+    attribute is a property, returning an unpacked copy of the grid, so modifying
+    ``states`` in place does not affect the grid. Assign to ``states`` instead.
+    """
+    @staticmethod
+    def _pack(bits):
+        """Pack the last axis of an array of zeros and ones into uint64 words,
+        the first element going in the least significant bit.
+        """
+        n_words = (bits.shape[-1] + 63) // 64
+        padded = np.zeros(bits.shape[:-1] + (64*n_words,), dtype=np.uint8)
+        padded[..., :bits.shape[-1]] = bits
+        return np.packbits(padded, axis=-1, bitorder='little').view('<u8').astype(np.uint64)
+
+    @property
+    def states(self):
+        """Unpacked copy of the grid."""
+        bytes_ = self.packed.astype('<u8').view(np.uint8)
+        return np.unpackbits(bytes_, axis=1, bitorder='little')[:, :self.N+2]
+
+    @states.setter
+    def states(self, states):
+        N = self.N
+        self.packed = self._pack(np.asarray(states, dtype=np.uint8))
+        # words selecting the interior cells 1..N of a row
+        mask = np.zeros(N+2, dtype=np.uint8)
+        mask[1:N+1] = 1
+        self._mask = self._pack(mask)
+
+    def _get_column(self, j):
+        """Return the states of column ``j`` as an array of 0 and 1 words."""
+        return (self.packed[:, j//64] >> np.uint64(j%64)) & np.uint64(1)
+
+    def _set_column(self, j, column):
+        """Set the states of column ``j`` to ``column``, an array of 0 and 1 words."""
+        w, b = j//64, np.uint64(j%64)
+        self.packed[:, w] = (self.packed[:, w] & ~(np.uint64(1) << b)) | (column << b)
+
+    def apply_0bc(self):
+        """Apply the zero boundary condition, see :py:meth:`FiniteGrid.apply_0bc`."""
+        N = self.N
+        self._set_column(0    , np.uint64(0))
+        self._set_column(N + 1, np.uint64(0))
+        self.packed[0    , :] = 0
+        self.packed[N + 1, :] = 0
+
+    def apply_rbc(self):
+        """Apply the reflecting boundary condition, see :py:meth:`FiniteGrid.apply_rbc`."""
+        N = self.N
+        self._set_column(0    , self._get_column(1))
+        self._set_column(N + 1, self._get_column(N))
+        self.packed[0    , :] = self.packed[1, :]
+        self.packed[N + 1, :] = self.packed[N, :]
+
+    def apply_pbc(self):
+        """Apply the periodic boundary condition, see :py:meth:`FiniteGrid.apply_pbc`.
+
+        The corners are taken care of by copying entire rows after the columns.
+        """
+        N = self.N
+        self._set_column(0    , self._get_column(N))
+        self._set_column(N + 1, self._get_column(1))
+        self.packed[0    , :] = self.packed[N, :]
+        self.packed[N + 1, :] = self.packed[1, :]
+
+    def _update(self):
+        """Replace the states of the interior cells by those of the next generation.
+
+        The boundary condition is not applied.
+        """
+        N = self.N
+        p = self.packed
+        one, s63 = np.uint64(1), np.uint64(63)
+        zeros = np.zeros((p.shape[0], 1), dtype=np.uint64)
+        # the states of cell j-1 (west) and j+1 (east), moved to bit position j,
+        # carrying the bits across word boundaries
+        west = (p << one) | (np.hstack((zeros, p[:, :-1])) >> s63)
+        east = (p >> one) | (np.hstack((p[:, 1:], zeros)) << s63)
+        neighbours = ( west[0:N  ], p[0:N  ], east[0:N  ]
+                     , west[1:N+1],           east[1:N+1]
+                     , west[2:N+2], p[2:N+2], east[2:N+2] )
+        # sum the 8 bitplanes, modulo 8
+        b0 = np.zeros_like(neighbours[0])
+        b1 = np.zeros_like(b0)
+        b2 = np.zeros_like(b0)
+        for x in neighbours:
+            carry0 = b0 & x
+            b0 ^= x
+            carry1 = b1 & carry0
+            b1 ^= carry0
+            b2 ^= carry1
+        alive = p[1:N+1]
+        if self._scratch is None:
+            self._scratch = np.empty_like(p)
+        self._scratch[1:N+1] = b1 & ~b2 & (b0 | alive) & self._mask
+        self.packed, self._scratch = self._scratch, self.packed
+
+    def _is_dead(self):
+        """Test if all interior cells are dead, see :py:meth:`FiniteGrid._is_dead`."""
+        N = self.N
+        return not (self.packed[1:N+1] & self._mask).any()
+
+    def _is_static(self):
+        """Test if the interior cells did not change during the last generation,
+        see :py:meth:`FiniteGrid._is_static`.
+        """
+        N = self.N
+        return np.array_equal(self.packed[1:N+1], self._scratch[1:N+1])
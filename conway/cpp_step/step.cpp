@@ -0,0 +1,62 @@
+/*
+ *  C++ source file for module conway.step
+ *
+ *  Computes the next generation of a FiniteGrid. The rows are distributed over
+ *  the OpenMP threads, and the inner loop is branchless, so that the compiler
+ *  can vectorize it (e.g. 32 cells per AVX2 instruction).
+ */
+
+#include <cstdint>
+#include <stdexcept>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+
+namespace py = pybind11;
+
+typedef py::array_t<std::uint8_t, py::array::c_style> states_t;
+
+void
+step
+  ( states_t states     // the current generation, including the ghost cells
+  , states_t new_states // the next generation, only the interior cells are set
+  )
+{
+    auto const n = states.shape(1); // = N+2
+    auto const N = n - 2;
+    if( states.ndim() != 2 || states.shape(0) != n
+     || new_states.ndim() != 2 || new_states.shape(0) != n || new_states.shape(1) != n )
+        throw std::invalid_argument("states and new_states must be (N+2)x(N+2) arrays.");
+
+    std::uint8_t const* s = states.data();
+    std::uint8_t      * t = new_states.mutable_data();
+
+    #pragma omp parallel for
+    for( py::ssize_t i = 1; i <= N; ++i )
+    {
+        std::uint8_t const* above = s + (i-1)*n;
+        std::uint8_t const* row   = s +  i   *n;
+        std::uint8_t const* below = s + (i+1)*n;
+        std::uint8_t      * out   = t +  i   *n;
+        #pragma GCC ivdep
+        for( py::ssize_t j = 1; j <= N; ++j )
+        {
+            std::uint8_t const count = above[j-1] + above[j] + above[j+1]
+                                     + row  [j-1]            + row  [j+1]
+                                     + below[j-1] + below[j] + below[j+1];
+            // a cell lives if it has 3 living neighbours, or if it is alive and has 2
+            out[j] = (count == 3) | (row[j] & (count == 2));
+        }
+    }
+}
+
+
+PYBIND11_MODULE(step, m)
+{// optional module doc-string
+    m.doc() = "pybind11 step plugin"; // optional module docstring
+    m.def("step", &step
+         , "Store the next generation of the interior cells of states in new_states."
+         , py::arg("states").noconvert()
+         , py::arg("new_states").noconvert()
+         );
+}
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+pytest configuration for the conway tests.
+
+Tests marked ``slow`` are stress tests, which are skipped unless pytest is run
+with ``--run-slow``.
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", default=False, help="also run the slow stress tests")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: stress tests, only run with --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
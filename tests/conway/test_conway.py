@@ -2,14 +2,52 @@
 
 """Tests for conway package."""
 
-import sys
+import itertools
 
 import numpy as np
-
-sys.path.insert(0,'.')
+import pytest
 
 import conway as cnw
 
+# print the grids in the evolve tests
+VERBOSE = False
+
+# all kernels, the tests of kernels that are not available are skipped
+KERNELS = ('numpy', 'lut', 'numba', 'scipy', 'cpp')
+
+
+def skip_if_unavailable(kernel):
+    """Skip the test if ``kernel`` is not in ``FiniteGrid.kernels``, e.g. because numba is not installed."""
+    if not kernel in cnw.FiniteGrid.kernels:
+        pytest.skip(f"kernel '{kernel}' is not available")
+
+
+def assert_bc(s, bc):
+    """Assert that the ghost rows and columns of states ``s`` satisfy boundary condition ``bc``."""
+    N = s.shape[0] - 2
+    if bc == 'zero':
+        assert np.all(s[0,:] == 0) and np.all(s[N+1,:] == 0)
+        assert np.all(s[:,0] == 0) and np.all(s[:,N+1] == 0)
+    else:
+        # the rows/columns copied into ghost rows/columns 0 and N+1
+        i0, i1 = (1, N) if bc == 'reflect' else (N, 1)
+        assert np.array_equal(s[0,:], s[i0,:]) and np.array_equal(s[N+1,:], s[i1,:])
+        assert np.array_equal(s[:,0], s[:,i0]) and np.array_equal(s[:,N+1], s[:,i1])
+
+
+def expected_lines(fg, boundary, symbols=' X'):
+    """The lines of ``fg`` as rendered by converting cell by cell."""
+    states = fg.states if boundary else fg.states[1:fg.N+1, 1:fg.N+1]
+    return [''.join(symbols[state] for state in row) for row in states.tolist()]
+
+
+def assert_printed(capsys, fg, boundary, symbols=None):
+    """Assert that ``fg.print(boundary, symbols)`` prints the current states cell by cell."""
+    capsys.readouterr()
+    fg.print(boundary=boundary, symbols=symbols)
+    lines = expected_lines(fg, boundary, fg.symbols)
+    assert capsys.readouterr().out == '\n'.join(lines) + '\n\n'
+
 
 def test_FiniteGrid():
     fg = cnw.FiniteGrid()
@@ -18,39 +56,76 @@ def test_FiniteGrid():
         fg.print(symbols='-+')
         fg.print(symbols=['   ','[X]'])
         fg.print(symbols=' X', boundary=False)
-        N = fg.N
+        # symbols of equal and of unequal width are converted differently
+        for symbols in ('-+', ['   ','[X]'], [' ', '[X]'], ' X'):
+            fg.symbols = symbols
+            for boundary in (True, False):
+                assert list(fg._lines(boundary)) == expected_lines(fg, boundary, symbols)
         s = fg.states
-        for i in range(N + 2):
-            for j in range(N + 2):
-                if i in (0 ,N+1) and j in (0, N+1): # a boundary cell
-                    if bc == 'zero':
-                        assert s[i,j] == 0
-                    else:
-                        if bc == 'reflect':
-                            i0 = 1 if (i == 0) else N
-                            j0 = 1 if (j == 0) else N
-                        else:  # 'periodic'
-                            i0 = N if (i == 0) else 1
-                            j0 = N if (j == 0) else 1
-                        assert s[i,j] == s[i0,j0]
-                else:
-                    assert fg.states[i,j] in (0,1)
-
-
-def test_evolve():
-    for i in range(100000):
-        print(i)
-        fg = cnw.FiniteGrid(3)
-        fg.print(boundary=False)
-        center_alive = fg.states[2,2]
-        center_count = np.sum(fg.states[1:4,1:4]) - fg.states[2,2]
+        # one byte per cell
+        assert s.dtype == np.uint8
+        # all cells, ghost cells included, are 0 or 1
+        assert np.all((s == 0) | (s == 1))
+        assert_bc(s, bc)
+
+
+@pytest.mark.parametrize("cls", (cnw.FiniteGrid, cnw.PackedGrid))
+def test_bc(cls):
+    fg = cls(6)
+    for bc in cnw.FiniteGrid.boundary_conditions:
+        # setting bc selects the boundary condition applied by apply_bc() and evolve
+        fg.bc = bc
+        fg.apply_bc()
+        assert_bc(fg.states, bc)
+        fg.evolve(draw=False)
+        assert_bc(fg.states, bc)
+    with pytest.raises(ValueError):
+        fg.bc = 'wrap'
+    assert fg.bc == 'periodic'
+
+
+def _expected_lut():
+    """Lookup table for the next state of the center cell of a 3x3 neighbourhood.
+
+    The index has bit ``3*i + j`` set if cell ``(i,j)`` of the neighbourhood is alive,
+    so bit 4 is the center cell.
+    """
+    lut = np.zeros(512, dtype=np.uint8)
+    for p in range(512):
+        center_alive = (p >> 4) & 1
+        center_count = bin(p).count('1') - center_alive
         if center_alive:
-            expected = center_count in (2,3)
+            lut[p] = center_count in (2,3)
         else:
-            expected = center_count == 3
-        print(center_alive, center_count, expected, "=======")
-        fg.evolve()
+            lut[p] = center_count == 3
+    return lut
+
+EXPECTED_LUT = _expected_lut()
+
+
+def expected_center(fg):
+    """The state of the center cell of a 3x3 FiniteGrid in the next generation."""
+    # pack the 9 cells in 2 bytes, cell (i,j) going to bit 3*i + j
+    index = int.from_bytes(np.packbits(fg.states[1:4,1:4], bitorder='little').tobytes(), 'little')
+    expected = EXPECTED_LUT[index]
+    if VERBOSE:
         fg.print(boundary=False)
+        print(f"{index:09b}", expected, "=======")
+    return expected
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_evolve(kernel):
+    skip_if_unavailable(kernel)
+    # all 2**9 = 512 states of the 3x3 neighbourhood of the center cell
+    patterns = np.array(list(itertools.product([0,1], repeat=9)), dtype=np.uint8).reshape(-1,3,3)
+    fg = cnw.FiniteGrid(3)
+    fg.kernel = kernel
+    for pattern in patterns:
+        fg.states[1:4,1:4] = pattern
+        fg.apply_bc()
+        expected = expected_center(fg)
+        fg.evolve(draw=VERBOSE)
         assert fg.states[2,2] == expected
 
 
@@ -58,53 +133,241 @@ def test_evolve1():
     fg = cnw.FiniteGrid(3)
     fg.states[:,:] = 0
     fg.states[1:4,1] = 1
-    fg.print(boundary=False)
-    center_alive = fg.states[2,2]
-    center_count = np.sum(fg.states[1:4,1:4]) - fg.states[2,2]
-    if center_alive:
-        expected = center_count in (2,3)
-    else:
-        expected = center_count == 3
-    print(center_alive, center_count, expected, "=======")
-    fg.evolve()
-    fg.print(boundary=False)
+    expected = expected_center(fg)
+    fg.evolve(draw=VERBOSE)
     assert fg.states[2,2] == expected
 
 
+_PATTERN_EVOLVE2 = np.array([[0,1,1],[0,1,0],[0,0,1]], dtype=np.uint8)
+
 def test_evolve2():
     fg = cnw.FiniteGrid(3)
     fg.states[:,:] = 0
-    fg.states[1:4,1:4] = np.array([[0,1,1],[0,1,0],[0,0,1]])
-    fg.print(boundary=False)
-    center_alive = fg.states[2,2]
-    center_count = np.sum(fg.states[1:4,1:4]) - fg.states[2,2]
-    if center_alive:
-        expected = center_count in (2,3)
-    else:
-        expected = center_count == 3
-    print(center_alive, center_count, expected, "=======")
-    fg.evolve()
-    fg.print(boundary=False)
+    fg.states[1:4,1:4] = _PATTERN_EVOLVE2
+    expected = expected_center(fg)
+    fg.evolve(draw=VERBOSE)
     assert fg.states[2,2] == expected
 
-def test_pdraw():
+def test_pdraw(capsys):
     fg = cnw.FiniteGrid(6)
     fg.print(boundary=False)
     fg.print(boundary=True)
+    # a glider keeps changing the grid, and moving across the periodic boundaries
+    fg.states[:,:] = 0
+    fg.states[1:4,1:4] = [[0,1,0],[0,0,1],[1,1,1]]
+    fg.apply_bc('periodic')
+    for generation in range(3):
+        # the repeated calls print the lines converted by the first call
+        for boundary in (False, False, True, True):
+            assert_printed(capsys, fg, boundary)
+        fg.evolve(draw=False)
+    # applying another boundary condition changes the ghost cells
+    fg.apply_bc('reflect')
+    assert_printed(capsys, fg, boundary=True)
+
+@pytest.mark.parametrize("cls", (cnw.FiniteGrid, cnw.PackedGrid))
+def test_pdraw_modified(capsys, cls):
+    fg = cls(6)
+    for boundary in (False, True):
+        assert_printed(capsys, fg, boundary)
+        # assign new states
+        states = fg.states.copy()
+        states[1:5,1:5] ^= 1
+        fg.states = states
+        assert_printed(capsys, fg, boundary)
+        if cls is cnw.FiniteGrid:
+            # modify the states in place (the states of a PackedGrid are a copy)
+            fg.states[2,2] ^= 1
+            assert_printed(capsys, fg, boundary)
+            fg.states[0,:] ^= 1
+            assert_printed(capsys, fg, boundary)
 
 def test_pdraw_evolve():
     fg = cnw.FiniteGrid(6)
     fg.print(boundary=False)
     fg.evolve(100)
 
-def test_dump():
-    filename = 'conway.test'
+@pytest.mark.parametrize("cls", (cnw.FiniteGrid, cnw.PackedGrid))
+@pytest.mark.parametrize("bc", cnw.FiniteGrid.boundary_conditions)
+@pytest.mark.parametrize("tile_rows, tile_t", ((1, 1), (3, 8), (64, 8), (4, 100)))
+def test_evolve_tiled(tile_rows, tile_t, bc, cls):
+    fg0 = cnw.FiniteGrid(6)
+    fg0.apply_bc(bc)
+    fg0.kernel = 'numpy'
+    fg1 = cls(6)
+    fg1.states = fg0.states.copy()
+    fg1.apply_bc(bc)
+    for generation in range(100): # evolve(100) would stop when all cells are dead
+        fg0.evolve(draw=False)
+    fg1.evolve_tiled(100, tile_rows=tile_rows, tile_t=tile_t)
+    assert fg0.generation == fg1.generation == 100
+    assert np.array_equal(fg0.states, fg1.states)
+
+@pytest.mark.parametrize("tile_rows, tile_t", ((0, 8), (64, 0), (-1, 8), (64, -1)))
+def test_evolve_tiled_invalid(tile_rows, tile_t):
+    fg = cnw.FiniteGrid(5)
+    with pytest.raises(ValueError):
+        fg.evolve_tiled(3, tile_rows=tile_rows, tile_t=tile_t)
+    assert fg.generation == 0
+
+class FakeScreen:
+    """Stands in for the curses ``stdscr``, recording the characters drawn by ``addstr``."""
+    def __init__(self):
+        self.rows = []
+
+    def addstr(self, i, j, s):
+        while len(self.rows) <= i:
+            self.rows.append([])
+        row = self.rows[i]
+        row.extend(' ' * (j + len(s) - len(row)))
+        row[j:j+len(s)] = s
+
+    def refresh(self):
+        pass
+
+    def line(self, i, width):
+        return ''.join(self.rows[i][:width])
+
+def assert_cursed(stdscr, fg, boundary):
+    """Assert that ``stdscr`` shows the current states and generation of ``fg``, converted cell by cell."""
+    i0 = 0 if boundary else 1
+    lines = expected_lines(fg, boundary, fg.symbols)
+    for i, line in enumerate(lines, start=i0):
+        assert stdscr.line(i, len(line)) == line
+    assert stdscr.line(i0 + len(lines), len(str(fg.generation))) == str(fg.generation)
+
+def test_curse():
+    fg = cnw.FiniteGrid(6, boundary='periodic')
+    # a glider keeps changing the grid, and moving across the periodic boundaries
+    fg.states[:,:] = 0
+    fg.states[1:4,1:4] = [[0,1,0],[0,0,1],[1,1,1]]
+    fg.apply_bc()
+    stdscr = FakeScreen()
+    # boundary and symbols changes trigger a full redraw, the other calls only
+    # redraw the cells that changed
+    for boundary, symbols in ((True, ' X'), (True, ' X'), (False, ' X'), (False, ['  ','[]']),
+                              (True, ['  ','[]']), (True, '-+'), (True, ['   ','[X]'])):
+        for generation in range(3):
+            fg.curse(stdscr, boundary=boundary, symbols=symbols)
+            assert_cursed(stdscr, fg, boundary)
+            fg.evolve(draw=False)
+    # modify the states directly, both with a full and with an incremental redraw
+    for boundary in (True, False):
+        for redraw in (True, False):
+            fg.curse(stdscr, boundary=boundary, redraw=True)
+            fg.states[1:5,1:5] ^= 1
+            fg.curse(stdscr, boundary=boundary, redraw=redraw)
+            assert_cursed(stdscr, fg, boundary)
+            states = fg.states.copy()
+            states[2:4,:] ^= 1
+            fg.states = states
+            fg.curse(stdscr, boundary=boundary, redraw=redraw)
+            assert_cursed(stdscr, fg, boundary)
+
+@pytest.mark.parametrize("cls", (cnw.FiniteGrid, cnw.PackedGrid))
+def test_stop_if_static(cls):
+    fg = cls(6)
+    states = np.zeros((8,8), dtype=np.uint8)
+    states[2:4,2:4] = 1 # a block is a still life
+    fg.states = states
+    fg.evolve(10, draw=False, stop_if_static=True)
+    assert fg.generation == 1
+
+@pytest.mark.parametrize("cls", (cnw.FiniteGrid, cnw.PackedGrid))
+def test_stop_if_dead(cls):
+    fg = cls(6)
+    states = np.zeros((8,8), dtype=np.uint8)
+    states[3,3] = 1 # a single cell dies of loneliness
+    fg.states = states
+    fg.evolve(10, draw=False)
+    assert fg.generation == 1
+
+@pytest.mark.parametrize("cls", (cnw.FiniteGrid, cnw.PackedGrid))
+def test_view(cls):
+    fg = cls(6)
+    view = fg.view
+    fg.evolve(3, draw=False)
+    assert fg.view is view
+    assert np.array_equal(view, fg.states[1:7,1:7])
+
+def assert_kernel(kernel, bc, N, n_generations):
+    """Assert that ``kernel`` evolves a random NxN grid with boundary condition ``bc``
+    in the same way as the ``numpy`` kernel.
+    """
+    fg0 = cnw.FiniteGrid(N)
+    fg0.apply_bc(bc)
+    fg0.kernel = 'numpy'
+    fg1 = cnw.FiniteGrid(N)
+    fg1.states[:,:] = fg0.states
+    fg1.apply_bc(bc)
+    fg1.kernel = kernel
+    for generation in range(n_generations):
+        fg0.evolve(draw=False)
+        fg1.evolve(draw=False)
+        assert np.array_equal(fg0.states, fg1.states)
+        assert_bc(fg1.states, bc)
+
+@pytest.mark.parametrize("bc", cnw.FiniteGrid.boundary_conditions)
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_kernels(kernel, bc):
+    skip_if_unavailable(kernel)
+    assert_kernel(kernel, bc, N=20, n_generations=10)
+
+@pytest.mark.parametrize("kernel", ('nmba', 'c++', ''))
+def test_kernels_invalid(kernel):
+    fg = cnw.FiniteGrid(6)
+    fg.kernel = kernel
+    with pytest.raises(ValueError):
+        fg.evolve(draw=False)
+    assert fg.generation == 0
+
+@pytest.mark.slow
+@pytest.mark.parametrize("bc", cnw.FiniteGrid.boundary_conditions)
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_kernels_large(kernel, bc):
+    skip_if_unavailable(kernel)
+    assert_kernel(kernel, bc, N=1000, n_generations=100)
+
+@pytest.mark.parametrize("bc", cnw.FiniteGrid.boundary_conditions)
+@pytest.mark.parametrize("N", (3, 62, 63, 100)) # below, at and above the 64 cells per word
+def test_PackedGrid(N, bc):
+    fg = cnw.FiniteGrid(N)
+    fg.apply_bc(bc)
+    pg = cnw.PackedGrid(N)
+    pg.states = fg.states
+    pg.apply_bc(bc)
+    assert pg.packed.dtype == np.uint64
+    assert pg.states.dtype == np.uint8
+    assert np.array_equal(fg.states, pg.states)
+    for generation in range(10):
+        fg.evolve(draw=False)
+        pg.evolve(draw=False)
+        assert np.array_equal(fg.states, pg.states)
+
+def test_dump(tmp_path):
+    filename = str(tmp_path / 'conway.test')
     fg0 = cnw.FiniteGrid(10)
     fg0.dump(filename=filename)
     fg1 = cnw.FiniteGrid(load=True, filename=filename)
     assert fg0.N == fg1.N
     assert fg0.bc == fg1.bc
-    assert np.all(fg0.states == fg1.states)
+    assert np.array_equal(fg0.states, fg1.states)
+
+@pytest.mark.parametrize("bc", cnw.FiniteGrid.boundary_conditions)
+def test_dump_PackedGrid(tmp_path, bc):
+    filename = str(tmp_path / 'conway.test')
+    pg0 = cnw.PackedGrid(70, boundary=bc)
+    pg0.evolve(3, draw=False)
+    pg0.dump(filename=filename)
+    pg1 = cnw.PackedGrid.load(filename)
+    assert type(pg1) is cnw.PackedGrid
+    assert pg0.N == pg1.N
+    assert pg0.bc == pg1.bc
+    assert pg0.generation == pg1.generation
+    assert np.array_equal(pg0.states, pg1.states)
+    pg0.evolve(draw=False)
+    pg1.evolve(draw=False)
+    assert np.array_equal(pg0.states, pg1.states)
 
 
 # ==============================================================================